@@ -1,6 +1,6 @@
-from SimpleFSM.state import State
+from SimpleFSM.state import EventGuard, State
 import networkx as nx
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 
 class MetaFSM(type):
   def __new__(cls, name, base, attrs):
@@ -66,6 +66,8 @@ class MetaFSM(type):
 
           # Set State object in class dictionary by name
           new_cls.states[value.name] = value
+          # Key used by guards to read the event type from event items
+          value.event_type_key = new_cls.event_type_key
 
   @staticmethod
   def set_state_actions(attrs:Dict, new_cls)->None:
@@ -85,6 +87,8 @@ class MetaFSM(type):
     
           # set state action in State object  
           new_cls.states[state_name].action = action
+          new_cls.states[state_name].action_guard = MetaFSM.compile_guard(
+            state_name, getattr(action, 'event_types', None), getattr(action, 'event_guard', None))
 
   @staticmethod
   def set_state_transitions(attrs:Dict, new_cls)->Set:
@@ -98,22 +102,71 @@ class MetaFSM(type):
         if isinstance(value, staticmethod) and hasattr(transition:=value.__func__, 'state_transition'):
           state_name = getattr(transition, 'state_transition')
           transition_dests = getattr(transition, 'transition_dests')
+          event_types = getattr(transition, 'event_types', None)
 
           # state listed must be an existing one
           if state_name not in new_cls.states: 
             raise AttributeError(f"No corresponding State named {state_name} found for transition")
-          # all states can only have one transition defined
-          elif new_cls.states[state_name].transition is not None:
+          # all states can only have one transition defined without event types
+          elif event_types is None and new_cls.states[state_name].transition is not None:
             raise AttributeError(f"Only one transition can be defined for state {state_name}")
+          # transitions with event types can not handle the same event type
+          elif event_types is not None and \
+            len(overlap := event_types & new_cls.states[state_name].transition_index.keys()) > 0:
+            raise AttributeError(f"The following event types already have a transition for state {state_name}: {overlap}")
           # defined destination states must be valid states
           elif len(non_defined_sates := set(transition_dests) - set(new_cls.states.keys())) > 0:
             raise AttributeError(f"The following {state_name} transition destination states are not defined states: {non_defined_sates}")
 
-          # set transition method in State object  
-          new_cls.states[state_name].transition = transition
-          # add destinations to State object
-          setattr(new_cls.states[state_name], 'transition_dests', transition_dests)
+          state_obj = new_cls.states[state_name]
+          # event types are resolved by the index so only key/value conditions remain in the guard
+          guard = MetaFSM.compile_guard(state_name, event_types, getattr(transition, 'event_guard', None), 
+                                        indexed=True)
+
+          if event_types is None:
+            # set transition method in State object  
+            state_obj.transition = transition
+            state_obj.transition_guard = guard
+          else:
+            # index transition by each event type it handles
+            for event_type in event_types:
+              state_obj.transition_index[event_type] = (transition, guard)
+
+          # add destinations to State object, combining those of all transitions
+          dests = getattr(state_obj, 'transition_dests', [])
+          setattr(state_obj, 'transition_dests', dests + [dest for dest in transition_dests if dest not in dests])
         
           states_with_transition.add(state_name)
 
+      # States that skip events stay in place, so add the self edge for the graph
+      for state_name in states_with_transition:
+        state_obj = new_cls.states[state_name]
+        skips_events = state_obj.transition is None or state_obj.transition_guard is not None\
+          or any(guard is not None for _, guard in state_obj.transition_index.values())
+        if skips_events and state_name not in state_obj.transition_dests:
+          state_obj.transition_dests = state_obj.transition_dests + [state_name]
+
       return states_with_transition
+
+  @staticmethod
+  def compile_guard(state_name:str, event_types:Optional[frozenset], conditions:Optional[Dict], 
+                    indexed:bool=False)->Optional[EventGuard]:
+      '''Compile declared event types and key/value conditions into an EventGuard
+
+      If indexed, the event types are only validated since the State index resolves them. 
+      Returns None when there is nothing left to check.
+      '''
+
+      if event_types is not None and len(event_types) == 0:
+        raise AttributeError(f"Event types for state {state_name} can not be empty")
+      if conditions is not None and not isinstance(conditions, dict):
+        raise AttributeError(f"Guard for state {state_name} must be a dictionary of key/value conditions")
+
+      if indexed:
+        event_types = None
+
+      # no guard declared, State calls user code for every event
+      if event_types is None and not conditions:
+        return None
+
+      return EventGuard(event_types, conditions)
@@ -15,6 +15,9 @@ class FSM(metaclass=MetaFSM):
 
   __default_contexts = {'curent_state'}
 
+  # Event item key used by declarative guards to find the event type
+  event_type_key = 'type'
+
   def __init__(self, user_context_data:Dict=dict(), checkpoint_file_path:str=None, 
                start_from_checkpoint_file:str=None, checkpoint_every:int=None, 
                replace_checkpoint=True):
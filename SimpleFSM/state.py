@@ -1,10 +1,27 @@
-from typing import List, Callable
-
-def state_action(state_name):
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Callable
+
+def _freeze_event_types(event_types:Iterable):
+  '''Normalize declared event types to a frozenset, a single string is one event type'''
+  if event_types is None:
+    return None
+  if isinstance(event_types, str):
+    return frozenset([event_types])
+  return frozenset(event_types)
+
+def _is_mapping(event_item)->bool:
+  '''Check if event item is a mapping, avoiding the slower ABC check for plain dictionaries'''
+  return type(event_item) is dict or isinstance(event_item, Mapping)
+
+def state_action(state_name, event_types:Iterable=None, guard:Dict=None):
   '''Decorator to designate a state action that is to be attached to State object
 
     Parameters:
     state_name (str) - Name of the State object this action applies to
+    event_types (Iterable) - Optional event types this action runs for. The event type 
+      is read from the event item using the FSM event_type_key (default 'type')
+    guard (Dict) - Optional key/value pairs the event item must match for the action to run. 
+      A set value matches any of its members, all other values must be equal
 
     The wrapped method must have the signature: 
       <any_method_name>(event_item, context_data)->None
@@ -17,17 +34,27 @@ def state_action(state_name):
   def enriched_action(func: Callable):
     # set state_action attribute for identification
     setattr(func, 'state_action', state_name)
+    setattr(func, 'event_types', _freeze_event_types(event_types))
+    setattr(func, 'event_guard', guard)
     return func
 
   return enriched_action 
 
-def state_transition(state_name:str, dests: List):
+def state_transition(state_name:str, dests: List, event_types:Iterable=None, guard:Dict=None):
   '''Decorator to designate a state transition that is to be attached to a State object
   
     Parameters:
     state_name (str) - Name of the State object this action applies to
     dests (List) - A list of state names that this transition logic
       routes to. These must be defined states
+    event_types (Iterable) - Optional event types this transition handles. A State can have 
+      several transitions as long as their event types do not overlap, and at most one 
+      transition without event types which handles all other event types
+    guard (Dict) - Optional key/value pairs the event item must match for the transition to run. 
+      A set value matches any of its members, all other values must be equal
+
+    Events not matching a transition's event types or guard leave the FSM in the same State
+    without calling the transition.
 
     The wrapped method must have the signature: 
       <any_method_name>(event_item, context_data)->str
@@ -44,10 +71,57 @@ def state_transition(state_name:str, dests: List):
     # set state_transition attribute for identification
     setattr(func, 'state_transition', state_name)
     setattr(func, 'transition_dests', dests)
+    setattr(func, 'event_types', _freeze_event_types(event_types))
+    setattr(func, 'event_guard', guard)
     return func
   
   return enriched_transition
 
+class EventGuard:
+  '''Compiled declarative guard checked by the framework before calling user code'''
+
+  __slots__ = ('event_types', 'conditions')
+
+  def __init__(self, event_types:frozenset=None, conditions:Dict=None):
+    '''Initialize guard from the declared event types and key/value conditions
+
+    Parameters:
+    event_types (frozenset) - Event types the guard accepts. If None, all event types are accepted
+    conditions (Dict) - Key/value pairs the event item must match. Set values are 
+      membership tests, all other values are equality tests
+    '''
+    self.event_types = event_types
+    self.conditions = tuple(
+      (key, isinstance(value, (set, frozenset)), 
+       frozenset(value) if isinstance(value, (set, frozenset)) else value)
+      for key, value in (conditions or dict()).items()
+    )
+
+  def matches(self, event_item, event_type_key:str)->bool:
+    '''Check if event item passes the guard - Called by FSM framework'''
+
+    # guards can only be evaluated on mapping event items
+    if not _is_mapping(event_item):
+      return False
+
+    try:
+      if self.event_types is not None and event_item.get(event_type_key) not in self.event_types:
+        return False
+
+      for key, is_member, value in self.conditions:
+        if key not in event_item:
+          return False
+        if is_member:
+          if event_item[key] not in value:
+            return False
+        elif event_item[key] != value:
+          return False
+    except TypeError:
+      # unhashable event values can not be members of the guard sets
+      return False
+
+    return True
+
 class State:
   '''Class to represent a State node'''
   def __init__(self, name:str, is_start: bool=False):
@@ -67,6 +141,11 @@ class State:
     self._is_start = is_start
     self.action = None
     self.transition = None
+    # Set by the framework from the declared guards
+    self.event_type_key = 'type'
+    self.action_guard = None
+    self.transition_guard = None
+    self.transition_index = dict()
 
   @property
   def action(self):
@@ -105,8 +184,11 @@ class State:
       Users can read and write to this as needed. 
     '''
 
-    if self.action:
-      _ = self.action(event_item, context_data)
+    if self._action:
+      # skip action without calling it if the event does not pass the guard
+      if self.action_guard is not None and not self.action_guard.matches(event_item, self.event_type_key):
+        return
+      _ = self._action(event_item, context_data)
 
   def do_transition(self, event_item, context_data)->None:
       '''Performs the transition for the State
@@ -117,5 +199,22 @@ class State:
     event_item - Event item the FSM is processing and passed to State
     context_data (Dict) - Dictionary to store state for processing by the State object transition. 
       Users can read and write to this as needed. 
+
+    Returns - Name of the next State, which is this State if no transition handles the event
     '''
-      return self.transition(event_item, context_data)
\ No newline at end of file
+      transition, guard = self._transition, self.transition_guard
+
+      # dispatch by event type to the indexed transition, falling back to the default transition
+      if self.transition_index and _is_mapping(event_item):
+        try:
+          indexed = self.transition_index.get(event_item.get(self.event_type_key))
+        except TypeError:
+          # unhashable event type can not be indexed so the event is skipped
+          return self.name
+        if indexed is not None:
+          transition, guard = indexed
+
+      if transition is None or (guard is not None and not guard.matches(event_item, self.event_type_key)):
+        return self.name
+
+      return transition(event_item, context_data)
\ No newline at end of file
@@ -171,4 +171,189 @@ def test_all_states_have_transition():
             @staticmethod 
             @state_action("state_two")
             def state_two_proc(event_item, context_data):
-                context_data['value'] = 2
\ No newline at end of file
+                context_data['value'] = 2
+
+
+@pytest.fixture
+def GuardedFSM():
+    class GuardedFSM(FSM):
+        idle = State("idle", is_start=True)
+        busy = State("busy")
+
+        @staticmethod
+        @state_transition("idle", ["busy"], event_types={"start"})
+        def idle_start_trans(event_item, context_data):
+            context_data['calls'] += 1
+            return "busy"
+
+        @staticmethod
+        @state_transition("idle", ["idle"], event_types={"ping"}, guard={'source': {'web', 'app'}})
+        def idle_ping_trans(event_item, context_data):
+            context_data['calls'] += 1
+            return "idle"
+
+        @staticmethod
+        @state_action("idle", event_types={"ping"})
+        def idle_proc(event_item, context_data):
+            context_data['pings'] += 1
+
+        @staticmethod
+        @state_transition("busy", ["idle"], guard={'done': True})
+        def busy_trans(event_item, context_data):
+            context_data['calls'] += 1
+            return "idle"
+
+    return GuardedFSM
+
+def test_guarded_transitions_indexed(GuardedFSM):
+    assert set(GuardedFSM.states['idle'].transition_index.keys()) == {'start', 'ping'}
+    assert GuardedFSM.states['idle'].transition is None
+    assert GuardedFSM.states['busy'].transition is not None
+    assert set(GuardedFSM.FSM_graph.edges) == {('idle', 'busy'), ('idle', 'idle'), ('busy', 'idle'), ('busy', 'busy')}
+
+def test_guarded_fsm_skips_events(GuardedFSM, tmp_path):
+    test_fsm = GuardedFSM(checkpoint_file_path=tmp_path, user_context_data={'calls': 0, 'pings': 0})
+    test_fsm.start([{'type': 'noise'}, 'noise', {'type': 'ping', 'source': 'cli'}, {'type': 'ping', 'source': 'web'}])
+
+    assert test_fsm.current_state.name == 'idle'
+    assert test_fsm.user_context_data == {'calls': 1, 'pings': 2}
+    assert test_fsm._events_processed == 4
+
+    test_fsm.start([{'type': 'start'}, {'type': 'work', 'done': False}, {'type': 'work'}])
+
+    assert test_fsm.current_state.name == 'busy'
+    assert test_fsm.user_context_data['calls'] == 2
+
+    test_fsm.start([{'type': 'work', 'done': True}])
+
+    assert test_fsm.current_state.name == 'idle'
+    assert test_fsm.user_context_data['calls'] == 3
+
+def test_guarded_transition_event_types_unique():
+    with pytest.raises(AttributeError) as attr_err:
+        class TestFSM(FSM):
+            state_one = State("state_one", is_start=True)
+
+            @staticmethod
+            @state_transition("state_one", ["state_one"], event_types={"a", "b"})
+            def state_one_trans(event_item, context_data):
+                return "state_one"
+
+            @staticmethod
+            @state_transition("state_one", ["state_one"], event_types={"b"})
+            def state_one_other_trans(event_item, context_data):
+                return "state_one"
+
+def test_guarded_fsm_skips_unhashable_values(GuardedFSM, tmp_path):
+    test_fsm = GuardedFSM(checkpoint_file_path=tmp_path, user_context_data={'calls': 0, 'pings': 0})
+    test_fsm.start([{'type': ['ping']}, {'type': {'kind': 'ping'}}, {'type': 'ping', 'source': ['web']}])
+
+    assert test_fsm.current_state.name == 'idle'
+    assert test_fsm.user_context_data == {'calls': 0, 'pings': 1}
+    assert test_fsm._events_processed == 3
+
+def test_custom_event_type_key(tmp_path):
+    class TestFSM(FSM):
+        event_type_key = 'kind'
+
+        state_one = State("state_one", is_start=True)
+        state_two = State("state_two")
+
+        @staticmethod
+        @state_transition("state_one", ["state_two"], event_types={"go"})
+        def state_one_trans(event_item, context_data):
+            return "state_two"
+
+        @staticmethod
+        @state_transition("state_two", ["state_one"])
+        def state_two_trans(event_item, context_data):
+            return "state_one"
+
+    assert TestFSM.states['state_one'].event_type_key == 'kind'
+    assert ('state_one', 'state_one') in TestFSM.FSM_graph.edges
+
+    test_fsm = TestFSM(checkpoint_file_path=tmp_path)
+    test_fsm.start([{'type': 'go'}])
+    assert test_fsm.current_state.name == 'state_one'
+
+    test_fsm.start([{'kind': 'go'}])
+    assert test_fsm.current_state.name == 'state_two'
+
+def test_guarded_catch_all_transition(tmp_path):
+    class TestFSM(FSM):
+        state_one = State("state_one", is_start=True)
+        state_two = State("state_two")
+        state_three = State("state_three")
+
+        @staticmethod
+        @state_transition("state_one", ["state_two"], event_types={"two"})
+        def state_one_two_trans(event_item, context_data):
+            return "state_two"
+
+        @staticmethod
+        @state_transition("state_one", ["state_three"], guard={'level': {'high', 'max'}})
+        def state_one_other_trans(event_item, context_data):
+            return "state_three"
+
+        @staticmethod
+        @state_action("state_one", guard={'log': True})
+        def state_one_proc(event_item, context_data):
+            context_data['logged'] += 1
+
+        @staticmethod
+        @state_transition("state_two", ["state_one"])
+        def state_two_trans(event_item, context_data):
+            return "state_one"
+
+        @staticmethod
+        @state_transition("state_three", ["state_one"])
+        def state_three_trans(event_item, context_data):
+            return "state_one"
+
+    test_fsm = TestFSM(checkpoint_file_path=tmp_path, user_context_data={'logged': 0})
+    test_fsm.start([{'type': 'noise', 'level': 'low', 'log': True}, {'type': 'noise', 'log': False}])
+
+    assert test_fsm.current_state.name == 'state_one'
+    assert test_fsm.user_context_data['logged'] == 1
+
+    test_fsm.start([{'type': 'two', 'level': 'high'}])
+    assert test_fsm.current_state.name == 'state_two'
+
+    test_fsm.start([{'type': 'noise', 'log': True}, {'type': 'noise', 'level': 'max'}])
+    assert test_fsm.current_state.name == 'state_three'
+    assert test_fsm.user_context_data['logged'] == 2
+
+def test_guard_must_be_dict():
+    with pytest.raises(AttributeError) as attr_err:
+        class TestFSM(FSM):
+            state_one = State("state_one", is_start=True)
+
+            @staticmethod
+            @state_transition("state_one", ["state_one"], guard=[('source', 'web')])
+            def state_one_trans(event_item, context_data):
+                return "state_one"
+
+def test_action_guard_must_be_dict():
+    with pytest.raises(AttributeError) as attr_err:
+        class TestFSM(FSM):
+            state_one = State("state_one", is_start=True)
+
+            @staticmethod
+            @state_action("state_one", guard='web')
+            def state_one_proc(event_item, context_data):
+                pass
+
+            @staticmethod
+            @state_transition("state_one", ["state_one"])
+            def state_one_trans(event_item, context_data):
+                return "state_one"
+
+def test_event_types_not_empty():
+    with pytest.raises(AttributeError) as attr_err:
+        class TestFSM(FSM):
+            state_one = State("state_one", is_start=True)
+
+            @staticmethod
+            @state_transition("state_one", ["state_one"], event_types=set())
+            def state_one_trans(event_item, context_data):
+                return "state_one"
@@ -1,4 +1,4 @@
-from SimpleFSM.state import state_action, state_transition
+from SimpleFSM.state import EventGuard, state_action, state_transition
 
 
 def test_state_action_decorator():
@@ -19,3 +19,33 @@ def test_state_transition_decorator():
     assert getattr(test_transition, 'state_transition') == 'my_state'
     assert getattr(test_transition, 'transition_dests') == ['dest_state_1', 'dest_state_2']
 
+
+def test_state_guard_decorators():
+    @state_transition("my_state", ["dest_state_1"], event_types="click", guard={'source': {'web', 'app'}})
+    def test_transition(event_item, context_data):
+        return 'dest_state_1'
+
+    @state_action("my_state", event_types=["click", "scroll"])
+    def test_action(event_item, context_data):
+        context_data["test_key"] = "test_value"
+
+    assert getattr(test_transition, 'event_types') == frozenset({'click'})
+    assert getattr(test_transition, 'event_guard') == {'source': {'web', 'app'}}
+    assert getattr(test_action, 'event_types') == frozenset({'click', 'scroll'})
+    assert getattr(test_action, 'event_guard') is None
+
+def test_event_guard_matches():
+    guard = EventGuard(frozenset({'click'}), {'source': {'web', 'app'}, 'user': 'admin'})
+
+    assert guard.matches({'type': 'click', 'source': 'web', 'user': 'admin'}, 'type')
+    assert not guard.matches({'type': 'scroll', 'source': 'web', 'user': 'admin'}, 'type')
+    assert not guard.matches({'type': 'click', 'source': 'cli', 'user': 'admin'}, 'type')
+    assert not guard.matches({'type': 'click', 'source': 'web'}, 'type')
+    assert not guard.matches('click', 'type')
+
+def test_event_guard_unhashable_values():
+    guard = EventGuard(frozenset({'click'}), {'source': {'web', 'app'}})
+
+    assert not guard.matches({'type': ['click'], 'source': 'web'}, 'type')
+    assert not guard.matches({'type': 'click', 'source': ['web']}, 'type')
+    assert not EventGuard(None, {'y': {1}}).matches({'y': [1]}, 'type')